@@ -165,8 +165,9 @@ async def query_documentation(request: QueryRequest):
     try:
         logger.info(f"Received query: {request.question}")
 
-        # Execute query with verification
-        response = rag_chain.query(
+        # Execute query with verification (async path keeps the event loop
+        # free during the LLM round-trip)
+        response = await rag_chain.aquery(
             question=request.question,
             version_filter=request.version,
             include_sources=request.include_sources,
@@ -298,7 +299,7 @@ async def validate_index(version: Optional[str] = Query(None, description="Filte
 
 
 @app.get("/cache-stats", tags=["Statistics"])
-async def get_cache_stats():
+async def cache_stats():
     """Get cache statistics.
 
     Returns:
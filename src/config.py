@@ -37,6 +37,7 @@ class Settings(BaseSettings):
     # RAG Configuration
     top_k: int = Field(default=5, ge=1, le=20, description="Number of top results to retrieve")
     min_similarity_threshold: float = Field(default=0.5, ge=0.0, le=1.0, description="Minimum similarity score to generate answer")
+    verify_bypass_similarity: float = Field(default=0.85, ge=0.0, le=1.0, description="Top similarity above which answer verification is skipped")
 
     # Chunk Size Optimization Parameters
     chunk_strategy: str = Field(default="adaptive", description="Chunking strategy: 'anchor' (H2-based only) or 'adaptive' (smart splitting)")
@@ -58,6 +59,9 @@ class Settings(BaseSettings):
     cache_max_size: int = Field(default=1000, ge=100, description="Maximum cache size")
     embedding_cache_enabled: bool = Field(default=True, description="Enable embedding cache")
     retrieval_cache_enabled: bool = Field(default=True, description="Enable retrieval result cache")
+    semantic_cache_threshold: float = Field(default=0.95, ge=0.0, le=1.0, description="Cosine similarity above which cached results are reused for paraphrased queries")
+    answer_cache_enabled: bool = Field(default=True, description="Enable semantic answer cache")
+    semantic_answer_threshold: float = Field(default=0.97, ge=0.0, le=1.0, description="Cosine similarity above which a cached answer is returned without calling the LLM")
     
     # ChromaDB Performance Settings
     chroma_hnsw_M: int = Field(default=16, ge=4, le=64, description="HNSW M parameter")
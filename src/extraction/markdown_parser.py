@@ -10,7 +10,7 @@ from src.config import settings
 from src.utils.logger import app_logger as logger
 
 
-@dataclass
+@dataclass(slots=True)
 class DocSection:
     """Represents a documentation section with metadata."""
 
@@ -80,8 +80,18 @@ class MarkdownParser:
             List of DocSection objects
         """
         content = file_path.read_text(encoding="utf-8")
-        file_name = file_path.name
+        return self.parse_string(content, file_path.name)
 
+    def parse_string(self, content: str, file_name: str) -> list[DocSection]:
+        """Parse Markdown content already held in memory.
+
+        Args:
+            content: Markdown text to parse
+            file_name: Name used for anchors and section metadata
+
+        Returns:
+            List of DocSection objects
+        """
         logger.debug(f"Parsing {file_name}...")
 
         # Extract H1 title (main page title)
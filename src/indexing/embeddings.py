@@ -3,11 +3,10 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 
-import ollama
-
 from src.config import settings
 from src.utils.cache import get_embedding_cache
 from src.utils.logger import app_logger as logger
+from src.utils.ollama_pool import get_ollama_client
 
 
 class OllamaEmbeddings:
@@ -26,7 +25,7 @@ class OllamaEmbeddings:
         """
         self.model = model or settings.embedding_model
         self.base_url = base_url or settings.ollama_host
-        self.client = ollama.Client(host=self.base_url)
+        self.client = get_ollama_client(self.base_url)
         self._cached_model = None  # Track model for cache invalidation
         self.embedding_cache = get_embedding_cache()
 
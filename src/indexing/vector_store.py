@@ -1,13 +1,23 @@
 """ChromaDB vector store integration."""
 
+import hashlib
+import json
 import os
+import queue
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Set
+from collections import Counter, deque
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
 
 # Disable ChromaDB telemetry to prevent Posthog errors
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 
 from src.config import settings
@@ -16,6 +26,29 @@ from src.indexing.embeddings import OllamaEmbeddings
 from src.utils.cache import get_retrieval_cache
 from src.utils.logger import app_logger as logger
 
+# Matches any non-whitespace character; used to test for whitespace-only
+# content without allocating a stripped copy of every document
+_NON_WS_RE = re.compile(r"\S")
+
+# Metadata keys in the order their values are assembled in add_sections;
+# dict(zip(...)) over a shared key tuple is cheaper than a dict literal
+# rebuilt for every section
+# Upper bound on collection size for the in-memory mirror index; above
+# this the matrix would no longer be comfortably RAM-resident and search
+# falls back to ChromaDB's HNSW index
+_MEM_INDEX_MAX_DOCS = 50_000
+
+_META_KEYS = (
+    "version",
+    "file",
+    "section",
+    "heading_path",
+    "anchor",
+    "chunk_index",
+    "h1_title",
+    "natural_id",
+)
+
 
 class VectorStore:
     """Manage document storage and retrieval with ChromaDB."""
@@ -78,138 +111,384 @@ class VectorStore:
             )
             logger.info(f"Created new collection: {self.collection_name} with cosine distance metric")
 
-        # Initialize retrieval cache
+        # Resolve the distance metric once; it is fixed at collection creation
+        # so search doesn't need to guess per result
+        self._metric = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        if self._metric == "cosine":
+            # ChromaDB cosine distance is 0-2, where 0=identical, 2=opposite
+            self._to_sim = lambda d: 1.0 - d / 2.0
+        else:
+            # L2 (Euclidean squared): lower distance = higher similarity
+            self._to_sim = lambda d: 1.0 / (1.0 + d / 100.0)
+
+        # Initialize retrieval cache (its semantic tier reuses results for
+        # queries whose embeddings land close to a previously answered query,
+        # skipping both the HNSW query and the Chroma round-trip)
         self.retrieval_cache = get_retrieval_cache()
 
+        # Tiny exact-text LRU in front of embed_query so repeated query text
+        # (e.g. same question across version filters or top_k values) skips
+        # the embedding path entirely
+        self._qemb_cache: Dict[str, List[float]] = {}
+        self._qemb_order: deque = deque()
+
+        # Embedding dimensionality, learned from the first indexed batch
+        self._emb_dim: Optional[int] = None
+
+        # In-memory mirror of the collection's embeddings for exact
+        # brute-force search (built lazily; invalidated whenever the
+        # collection changes). At documentation-corpus sizes one BLAS
+        # matrix-vector product beats ChromaDB's Python/SQLite query path.
+        self._mem_index: Optional[Dict] = None
+        self._mem_index_unavailable = False
+
+        # Incremental per-version document counts (lazy-loaded; persisted to
+        # a sidecar file so restarts avoid a full metadata scan)
+        self._known_versions: Set[str] = {settings.laravel_version}
+        self._version_counts: Optional[Counter] = None
+        self._version_counts_path = Path(self.persist_dir) / f"{self.collection_name}_version_counts.json"
+
         logger.info(f"Initialized vector store: {self.collection_name}")
         logger.info(f"Persistence directory: {self.persist_dir}")
         logger.info(f"Current document count: {self.collection.count()}")
 
-    def add_sections(self, sections: List[DocSection], batch_size: int = 50,
-                     parallel: bool = True, max_workers: int = None) -> int:
+    @staticmethod
+    def _make_doc_id(natural_id: str) -> str:
+        """Derive a compact deterministic document ID.
+
+        Args:
+            natural_id: Human-readable "version_file_chunk" identifier
+
+        Returns:
+            Fixed-size 32-char hex digest, stable across re-indexing runs
+        """
+        return hashlib.blake2b(natural_id.encode(), digest_size=16).hexdigest()
+
+    @contextmanager
+    def _bulk_sqlite(self, unsafe: bool = False):
+        """Temporarily relax SQLite PRAGMAs on ChromaDB's connection for bulk inserts.
+
+        Insertion into a PersistentClient is bottlenecked on the SQLite write
+        path; WAL journaling with NORMAL synchronous and an in-memory temp
+        store speeds up bulk adds considerably. Prior values are restored on
+        exit. Accessing the connection relies on ChromaDB internals, so this
+        degrades to a no-op if the layout changes.
+
+        Args:
+            unsafe: Disable journaling and fsync entirely. Only appropriate
+                for from-scratch rebuilds where the store is disposable.
+        """
+        pragmas = {
+            "journal_mode": "OFF" if unsafe else "WAL",
+            "synchronous": "OFF" if unsafe else "NORMAL",
+            "temp_store": "memory",
+            "cache_size": "-262144",
+        }
+
+        conn = None
+        try:
+            sysdb = getattr(self.client, "_sysdb", None) or getattr(
+                getattr(self.client, "_server", None), "_sysdb", None
+            )
+            pool = getattr(sysdb, "_conn_pool", None)
+            if pool is not None:
+                conn = pool.connect()
+        except Exception as e:
+            logger.debug(f"Could not access ChromaDB SQLite connection: {e}")
+            conn = None
+
+        if conn is None:
+            yield
+            return
+
+        previous = {}
+        try:
+            for pragma, value in pragmas.items():
+                try:
+                    row = conn.execute(f"PRAGMA {pragma}").fetchone()
+                    previous[pragma] = row[0] if row else None
+                    conn.execute(f"PRAGMA {pragma}={value}")
+                except Exception as e:
+                    logger.debug(f"Could not set PRAGMA {pragma}: {e}")
+            logger.debug(f"Applied bulk-insert SQLite PRAGMAs (unsafe={unsafe})")
+            yield
+        finally:
+            for pragma, value in previous.items():
+                if value is None:
+                    continue
+                try:
+                    conn.execute(f"PRAGMA {pragma}={value}")
+                except Exception:
+                    pass
+
+    def add_sections(self, sections: Iterable[DocSection], batch_size: int = 50,
+                     parallel: bool = True, max_workers: int = None,
+                     total: Optional[int] = None, bulk_unsafe: bool = False) -> int:
         """Add documentation sections to the vector store with parallel embedding generation.
 
+        Sections are consumed batch_size at a time, so callers may pass a
+        generator and keep memory bounded regardless of corpus size.
+
         Args:
-            sections: List of DocSection objects to add
+            sections: Iterable of DocSection objects to add
             batch_size: Number of sections to process in each batch
             parallel: Whether to use parallel processing for embeddings (default: True)
             max_workers: Maximum number of parallel workers for embeddings (default: auto)
+            total: Total section count for progress/ETA reporting (inferred
+                when sections has a length, unknown for plain generators)
+            bulk_unsafe: Disable SQLite journaling/fsync during the run; only
+                for from-scratch rebuilds where the store is disposable
 
         Returns:
             Number of sections added
         """
-        logger.info(f"Adding {len(sections)} sections to vector store (parallel={parallel})...")
+        if total is None and hasattr(sections, "__len__"):
+            total = len(sections)
+
+        logger.info(
+            f"Adding {total if total is not None else 'streamed'} sections "
+            f"to vector store (parallel={parallel})..."
+        )
         start_time = time.time()
 
-        # Pre-check for existing IDs to avoid duplicate work
-        existing_ids: Set[str] = set()
-        try:
-            existing_docs = self.collection.get()
-            existing_ids = set(existing_docs.get("ids", []))
-            logger.debug(f"Found {len(existing_ids)} existing documents")
-        except Exception as e:
-            logger.warning(f"Could not check existing documents: {e}")
+        # IDs emitted during this run (guards against duplicates across batches
+        # without materializing the whole collection's ID set up front)
+        seen_ids: Set[str] = set()
 
         added_count = 0
         skipped_count = 0
         failed_count = 0
-        total_batches = (len(sections) + batch_size - 1) // batch_size
-
-        for i in range(0, len(sections), batch_size):
-            batch = sections[i:i + batch_size]
-            batch_num = i // batch_size + 1
-
-            # Prepare data for batch with deduplication
-            documents = []
-            metadatas = []
-            ids = []
-            batch_ids_to_add = []
-
-            for section in batch:
-                # Create unique ID
-                doc_id = f"{section.version}_{section.file}_{section.chunk_index}"
-
-                # Skip if already exists
-                if doc_id in existing_ids:
-                    skipped_count += 1
-                    continue
-
-                # Create document text
-                doc_text = f"# {section.section}\n\n{section.content}"
-
-                # Skip empty documents
-                if not doc_text.strip():
-                    skipped_count += 1
-                    continue
+        total_batches = (total + batch_size - 1) // batch_size if total is not None else None
+
+        # Progress logging state: log at most every few seconds and smooth
+        # the throughput with an exponential moving average
+        ema_rate = 0.0
+        last_log = start_time
+        added_since_log = 0
+
+        # Pipeline embedding with storage: a worker thread embeds batch N+1
+        # while the main thread writes batch N to ChromaDB, hiding Ollama
+        # latency behind the SQLite write path. Bounded queues provide
+        # backpressure so at most a few batches are in flight.
+        embed_q: queue.Queue = queue.Queue(maxsize=2)
+        store_q: queue.Queue = queue.Queue(maxsize=2)
+
+        def _embed_worker() -> None:
+            while True:
+                item = embed_q.get()
+                if item is None:
+                    store_q.put(None)
+                    return
+                seq, documents, metadatas, ids = item
+                try:
+                    # Embed each distinct text once and scatter the vectors
+                    # back; doc corpora repeat boilerplate fragments verbatim
+                    text_to_indices: Dict[str, List[int]] = {}
+                    for idx, text in enumerate(documents):
+                        text_to_indices.setdefault(text, []).append(idx)
+
+                    if len(text_to_indices) < len(documents):
+                        unique_embeddings = self.embeddings.embed_documents(
+                            list(text_to_indices),
+                            parallel=parallel,
+                            max_workers=max_workers,
+                        )
+                        embeddings = [None] * len(documents)
+                        for embedding, indices in zip(unique_embeddings, text_to_indices.values()):
+                            for idx in indices:
+                                embeddings[idx] = embedding
+                    else:
+                        embeddings = self.embeddings.embed_documents(
+                            documents,
+                            parallel=parallel,
+                            max_workers=max_workers,
+                        )
+                    store_q.put((seq, documents, metadatas, ids, embeddings, None))
+                except Exception as e:
+                    store_q.put((seq, documents, metadatas, ids, None, e))
+
+        def _store_batch(item) -> None:
+            nonlocal added_count, failed_count, ema_rate, last_log, added_since_log
+            seq, documents, metadatas, ids, embeddings, error = item
+
+            if error is not None:
+                logger.error(f"Error embedding batch {seq}: {error}")
+                failed_count += len(documents)
+                return
 
-                # Create metadata
-                metadata = {
-                    "version": section.version,
-                    "file": section.file,
-                    "section": section.section,
-                    "heading_path": section.heading_path,
-                    "anchor": section.anchor,
-                    "chunk_index": section.chunk_index,
-                    "h1_title": section.h1_title or "",
-                }
-
-                documents.append(doc_text)
-                metadatas.append(metadata)
-                ids.append(doc_id)
-                batch_ids_to_add.append(doc_id)
-
-            # Skip batch if all documents were duplicates
-            if not documents:
-                logger.debug(f"Batch {batch_num}/{total_batches}: All documents skipped (duplicates)")
-                continue
+            # Verify embeddings were generated
+            if len(embeddings) != len(documents):
+                logger.error(f"Embedding count mismatch: {len(embeddings)} != {len(documents)}")
+                failed_count += len(documents)
+                return
 
             try:
-                # Generate embeddings with parallel processing
-                embeddings = self.embeddings.embed_documents(
-                    documents,
-                    parallel=parallel,
-                    max_workers=max_workers
-                )
-
-                # Verify embeddings were generated
-                if len(embeddings) != len(documents):
-                    logger.error(f"Embedding count mismatch: {len(embeddings)} != {len(documents)}")
-                    failed_count += len(documents)
-                    continue
+                # Pack embeddings into a pre-sized buffer; np.empty skips the
+                # zero-fill pass since every row is overwritten. float16
+                # halves per-vector storage with no measurable cosine recall
+                # loss at 768-1024 dimensions.
+                if self._emb_dim is None:
+                    self._emb_dim = len(embeddings[0])
+                emb_buf = np.empty((len(embeddings), self._emb_dim), dtype=np.float16)
+                for row, embedding in enumerate(embeddings):
+                    emb_buf[row] = embedding
 
                 # Add to collection (bulk operation)
-                self.collection.add(
-                    documents=documents,
-                    embeddings=embeddings,
-                    metadatas=metadatas,
-                    ids=ids,
-                )
+                try:
+                    self.collection.add(
+                        documents=documents,
+                        embeddings=emb_buf,
+                        metadatas=metadatas,
+                        ids=ids,
+                    )
+                except (ValueError, TypeError):
+                    # Older ChromaDB versions only accept list-of-lists embeddings
+                    self.collection.add(
+                        documents=documents,
+                        embeddings=emb_buf.tolist(),
+                        metadatas=metadatas,
+                        ids=ids,
+                    )
 
-                # Update existing IDs set
-                existing_ids.update(batch_ids_to_add)
                 added_count += len(documents)
 
-                # Calculate progress and ETA
-                elapsed = time.time() - start_time
-                rate = added_count / elapsed if elapsed > 0 else 0
-                remaining = len(sections) - (added_count + skipped_count + failed_count)
-                eta = remaining / rate if rate > 0 else 0
-
-                logger.info(
-                    f"Batch {batch_num}/{total_batches}: Added {len(documents)} sections "
-                    f"({added_count}/{len(sections)} total, {skipped_count} skipped, "
-                    f"{failed_count} failed, ETA: {eta:.1f}s)"
-                )
+                # Keep incremental per-version counts in sync
+                self._known_versions.update(m["version"] for m in metadatas)
+                if self._version_counts is not None:
+                    for metadata in metadatas:
+                        self._version_counts[metadata["version"]] += 1
+
+                added_since_log += len(documents)
+
+                # Log progress at most every 5 seconds (or on the final
+                # batch), estimating ETA from an EMA of recent throughput
+                now = time.time()
+                is_last = total_batches is not None and seq == total_batches
+                if now - last_log >= 5.0 or is_last:
+                    window = now - last_log
+                    window_rate = added_since_log / window if window > 0 else 0.0
+                    ema_rate = window_rate if ema_rate == 0.0 else 0.3 * window_rate + 0.7 * ema_rate
+
+                    if total is not None:
+                        remaining = total - (added_count + skipped_count + failed_count)
+                        eta = remaining / ema_rate if ema_rate > 0 else 0
+                        progress = f"{added_count}/{total} total, ETA: {eta:.1f}s, "
+                    else:
+                        progress = f"{added_count} total, "
+
+                    batch_label = f"{seq}/{total_batches}" if total_batches else str(seq)
+                    logger.info(
+                        f"Batch {batch_label}: {progress}{skipped_count} skipped, "
+                        f"{failed_count} failed ({ema_rate:.1f} sections/sec)"
+                    )
+                    last_log = now
+                    added_since_log = 0
+
+                # Release per-batch buffers promptly so streamed indexing
+                # keeps a bounded working set
+                documents.clear()
+                metadatas.clear()
+                ids.clear()
 
             except Exception as e:
-                logger.error(f"Error adding batch {batch_num}: {e}")
+                logger.error(f"Error adding batch {seq}: {e}")
                 failed_count += len(documents)
-                continue
+
+        # Relax SQLite PRAGMAs for the duration of the bulk insert
+        with self._bulk_sqlite(unsafe=bulk_unsafe):
+            worker = threading.Thread(target=_embed_worker, daemon=True)
+            worker.start()
+
+            sections_iter = iter(sections)
+            batch_num = 0
+            while True:
+                batch = list(islice(sections_iter, batch_size))
+                if not batch:
+                    break
+                batch_num += 1
+
+                # Probe only this batch's candidate IDs for existence; include=[]
+                # keeps the response to ids, so the check is O(batch_size) instead
+                # of scanning the whole collection once up front
+                natural_ids = [f"{s.version}_{s.file}_{s.chunk_index}" for s in batch]
+                candidate_ids = [self._make_doc_id(nid) for nid in natural_ids]
+                try:
+                    existing_ids = set(self.collection.get(ids=candidate_ids, include=[])["ids"])
+                except Exception as e:
+                    logger.warning(f"Could not check existing documents: {e}")
+                    existing_ids = set()
+
+                # Prepare data for batch with deduplication
+                documents = []
+                metadatas = []
+                ids = []
+
+                for section, natural_id, doc_id in zip(batch, natural_ids, candidate_ids):
+                    # Skip if already exists
+                    if doc_id in existing_ids or doc_id in seen_ids:
+                        skipped_count += 1
+                        continue
+
+                    # Skip empty documents before allocating the formatted text
+                    if not (
+                        (section.section and _NON_WS_RE.search(section.section))
+                        or (section.content and _NON_WS_RE.search(section.content))
+                    ):
+                        skipped_count += 1
+                        continue
+
+                    # Create document text
+                    doc_text = "".join(("# ", section.section, "\n\n", section.content))
+
+                    # Create metadata (natural_id is the human-readable ID,
+                    # kept for debugging)
+                    metadata = dict(zip(_META_KEYS, (
+                        section.version,
+                        section.file,
+                        section.section,
+                        section.heading_path,
+                        section.anchor,
+                        section.chunk_index,
+                        section.h1_title or "",
+                        natural_id,
+                    )))
+
+                    documents.append(doc_text)
+                    metadatas.append(metadata)
+                    ids.append(doc_id)
+                    seen_ids.add(doc_id)
+
+                # Skip batch if all documents were duplicates
+                if not documents:
+                    logger.debug(f"Batch {batch_num}: All documents skipped (duplicates)")
+                    continue
+
+                # Drain already-embedded batches without blocking before
+                # handing the worker more work, so neither queue can stall
+                while True:
+                    try:
+                        done = store_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    _store_batch(done)
+
+                embed_q.put((batch_num, documents, metadatas, ids))
+
+            # Signal completion and store the remaining embedded batches
+            embed_q.put(None)
+            while True:
+                done = store_q.get()
+                if done is None:
+                    break
+                _store_batch(done)
+            worker.join()
 
         # Invalidate retrieval cache after adding new documents
         if added_count > 0:
             self.retrieval_cache.invalidate()
+            self._drop_memory_index()
             logger.info("Retrieval cache invalidated after indexing")
+            self._save_version_counts()
 
         elapsed = time.time() - start_time
         rate = added_count / elapsed if elapsed > 0 else 0
@@ -227,6 +506,8 @@ class VectorStore:
         query: str,
         top_k: int = None,
         version_filter: Optional[str] = None,
+        fetch_documents: bool = True,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict]:
         """Search for relevant documentation sections with caching and performance optimization.
 
@@ -234,9 +515,16 @@ class VectorStore:
             query: Search query
             top_k: Number of results to return
             version_filter: Filter by Laravel version
+            fetch_documents: Include document text in results. Callers that
+                filter results first can pass False and hydrate the survivors
+                with get_documents, skipping the dominant payload bytes
+            query_embedding: Pre-computed embedding for the query; callers
+                that already embedded the question (e.g. for the answer
+                cache) pass it here so it is never re-derived
 
         Returns:
             List of search results with metadata and similarity scores
+            (the "document" field is None when fetch_documents is False)
         """
         top_k = top_k or settings.top_k
         search_start = time.time()
@@ -244,13 +532,52 @@ class VectorStore:
         logger.debug(f"Searching for: '{query}' (top_k={top_k})")
 
         # Check cache first
-        cached_results = self.retrieval_cache.get(query, version_filter, top_k)
+        cached_results = self.retrieval_cache.get(
+            query, version_filter, top_k, fetch_documents=fetch_documents
+        )
         if cached_results is not None:
             logger.debug("Retrieval cache hit")
             return cached_results
 
-        # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+        # Generate query embedding unless the caller supplied one
+        # (memoized per exact query text either way)
+        if query_embedding is None:
+            query_embedding = self._qemb_cache.get(query)
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(query)
+            self._qemb_cache[query] = query_embedding
+            self._qemb_order.append(query)
+            if len(self._qemb_order) > 1024:
+                del self._qemb_cache[self._qemb_order.popleft()]
+
+        # Check the semantic cache for a near-duplicate query embedding
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query_vec))
+        unit_vec = query_vec / norm if norm > 0 else query_vec
+
+        cached_results = self.retrieval_cache.get_semantic(
+            unit_vec, version_filter, top_k, fetch_documents
+        )
+        if cached_results is not None:
+            logger.debug("Semantic cache hit")
+            return cached_results
+
+        # Serve from the in-memory mirror when it is available; one exact
+        # matrix product over a RAM-resident matrix is faster than the
+        # Chroma round-trip at this corpus size
+        mem_results = self._memory_search(unit_vec, top_k, version_filter, fetch_documents)
+        if mem_results is not None:
+            search_time = time.time() - search_start
+            self.retrieval_cache.set(
+                query, mem_results, version_filter, top_k,
+                fetch_documents=fetch_documents,
+                query_embedding=unit_vec,
+                latency=search_time,
+            )
+            logger.debug(
+                f"Found {len(mem_results)} results in {search_time*1000:.1f}ms (memory index)"
+            )
+            return mem_results
 
         # Prepare where clause for filtering
         where = {}
@@ -259,43 +586,51 @@ class VectorStore:
 
         # Query the collection with optimized parameters
         try:
+            include = ["metadatas", "distances"]
+            if fetch_documents:
+                include.append("documents")
+
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=[query_vec.tolist()],
                 n_results=min(top_k, 100),  # Limit to reasonable max
                 where=where if where else None,
-                include=["documents", "metadatas", "distances"],  # Only fetch needed fields
+                include=include,  # Only fetch needed fields
             )
 
-            # Format results and convert distance to similarity
+            # Format results and convert distance to similarity in one
+            # vectorized pass (the metric was resolved at __init__)
             formatted_results = []
             if results["ids"] and len(results["ids"][0]) > 0:
-                for i in range(len(results["ids"][0])):
-                    distance = results["distances"][0][i]
-                    
-                    # Convert distance to similarity based on metric
-                    # ChromaDB cosine distance is 0-2, where 0=identical, 2=opposite
-                    # ChromaDB L2 (Euclidean squared) distance is 0-infinity
-                    if distance < 3.0:  # Likely cosine distance (0-2 range)
-                        similarity = 1.0 - (distance / 2.0)  # Normalize to 0-1
-                    else:  # Likely L2/Euclidean squared distance
-                        # For L2: convert to similarity using inverse
-                        # Lower distance = higher similarity
-                        similarity = 1.0 / (1.0 + (distance / 100.0))
-                        logger.debug(f"Using L2 distance conversion: distance={distance:.2f}, similarity={similarity:.4f}")
-
-                    result = {
-                        "id": results["ids"][0][i],
-                        "document": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
+                ids = results["ids"][0]
+                docs = results["documents"][0] if fetch_documents else [None] * len(ids)
+                metas = results["metadatas"][0]
+                dists = np.asarray(results["distances"][0], dtype=np.float32)
+                sims = self._to_sim(dists)
+
+                formatted_results = [
+                    {
+                        "id": doc_id,
+                        "document": doc,
+                        "metadata": meta,
                         "distance": distance,
-                        "similarity": similarity,  # Add similarity score
+                        "similarity": similarity,
                     }
-                    formatted_results.append(result)
-
-            # Cache results
-            self.retrieval_cache.set(query, formatted_results, version_filter, top_k)
-
+                    for doc_id, doc, meta, distance, similarity in zip(
+                        ids, docs, metas, dists.tolist(), sims.tolist()
+                    )
+                ]
+
+            # Cache results (the embedding makes the entry reachable for
+            # paraphrased queries via the semantic tier; latency feeds the
+            # adaptive admission threshold)
             search_time = time.time() - search_start
+            self.retrieval_cache.set(
+                query, formatted_results, version_filter, top_k,
+                fetch_documents=fetch_documents,
+                query_embedding=unit_vec,
+                latency=search_time,
+            )
+
             logger.debug(f"Found {len(formatted_results)} results in {search_time*1000:.1f}ms")
             return formatted_results
 
@@ -303,6 +638,141 @@ class VectorStore:
             logger.error(f"Error searching vector store: {e}")
             return []
 
+    def get_documents(self, ids: List[str]) -> Dict[str, str]:
+        """Fetch document text for a set of document IDs.
+
+        Args:
+            ids: Document IDs to hydrate
+
+        Returns:
+            Mapping of document ID to document text
+        """
+        if not ids:
+            return {}
+
+        try:
+            results = self.collection.get(ids=ids, include=["documents"])
+            return dict(zip(results["ids"], results["documents"]))
+        except Exception as e:
+            logger.error(f"Error fetching documents: {e}")
+            return {}
+
+    def _build_memory_index(self) -> Optional[Dict]:
+        """Mirror the collection's embeddings into a normalized RAM matrix.
+
+        The one-time build fetches every embedding and metadata record from
+        ChromaDB; afterwards each query is a single BLAS matrix-vector
+        product plus an argpartition, with no SQLite involvement. Row
+        indices per version are precomputed so filtered queries stay
+        vectorized.
+
+        Returns:
+            Index dict with matrix/ids/metadatas/version_rows, or None when
+            the mirror cannot or should not be built
+        """
+        if self._metric != "cosine":
+            return None
+
+        count = self.collection.count()
+        if count == 0 or count > _MEM_INDEX_MAX_DOCS:
+            return None
+
+        results = self.collection.get(include=["embeddings", "metadatas"])
+        embeddings = results.get("embeddings")
+        if not embeddings:
+            return None
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        metadatas = results["metadatas"]
+        version_rows: Dict[str, List[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            version_rows.setdefault(metadata.get("version", "unknown"), []).append(row)
+
+        logger.info(f"Built in-memory search index over {len(matrix)} embeddings")
+        return {
+            "matrix": matrix,
+            "ids": results["ids"],
+            "metadatas": metadatas,
+            "version_rows": {v: np.asarray(rows) for v, rows in version_rows.items()},
+        }
+
+    def _memory_search(
+        self,
+        unit_vec: "np.ndarray",
+        top_k: int,
+        version_filter: Optional[str],
+        fetch_documents: bool,
+    ) -> Optional[List[Dict]]:
+        """Search the in-memory mirror index.
+
+        Args:
+            unit_vec: L2-normalized query embedding
+            top_k: Number of results to return
+            version_filter: Optional version filter
+            fetch_documents: Whether to hydrate document text for the hits
+
+        Returns:
+            Formatted results, or None when the mirror is unavailable and
+            the caller should fall back to ChromaDB
+        """
+        if self._mem_index_unavailable:
+            return None
+
+        if self._mem_index is None:
+            try:
+                self._mem_index = self._build_memory_index()
+            except Exception as e:
+                logger.debug(f"Could not build in-memory index: {e}")
+                self._mem_index = None
+            if self._mem_index is None:
+                # Don't retry the (potentially expensive) build every query
+                self._mem_index_unavailable = True
+                return None
+
+        index = self._mem_index
+        if version_filter is not None:
+            rows = index["version_rows"].get(version_filter)
+            if rows is None or len(rows) == 0:
+                return []
+            sims = index["matrix"][rows] @ unit_vec
+        else:
+            rows = None
+            sims = index["matrix"] @ unit_vec
+
+        top_k = min(top_k, len(sims))
+        top = np.argpartition(sims, -top_k)[-top_k:]
+        top = top[np.argsort(sims[top])[::-1]]
+        if rows is not None:
+            hit_rows = rows[top]
+        else:
+            hit_rows = top
+
+        hit_ids = [index["ids"][row] for row in hit_rows]
+        id_to_doc = self.get_documents(hit_ids) if fetch_documents else {}
+
+        formatted_results = []
+        for row, sim in zip(hit_rows, sims[top]):
+            # Same distance/similarity convention as the Chroma path
+            distance = 1.0 - float(sim)
+            doc_id = index["ids"][row]
+            formatted_results.append({
+                "id": doc_id,
+                "document": id_to_doc.get(doc_id) if fetch_documents else None,
+                "metadata": index["metadatas"][row],
+                "distance": distance,
+                "similarity": float(self._to_sim(distance)),
+            })
+        return formatted_results
+
+    def _drop_memory_index(self) -> None:
+        """Invalidate the in-memory mirror after the collection changes."""
+        self._mem_index = None
+        self._mem_index_unavailable = False
+
     def recreate_collection(self) -> bool:
         """Delete and recreate the collection with optimized settings.
 
@@ -333,6 +803,11 @@ class VectorStore:
 
             # Invalidate retrieval cache
             self.retrieval_cache.clear()
+            self._drop_memory_index()
+
+            # Reset per-version counts for the empty collection
+            self._version_counts = Counter()
+            self._save_version_counts()
 
             return True
 
@@ -352,14 +827,36 @@ class VectorStore:
         try:
             logger.warning(f"Clearing all documents for version {version}...")
 
-            # Get all IDs for the version
-            results = self.collection.get(
-                where={"version": version},
-            )
-
-            if results["ids"]:
-                self.collection.delete(ids=results["ids"])
-                logger.info(f"Cleared {len(results['ids'])} documents for version {version}")
+            try:
+                # Delete server-side by metadata filter (single round-trip)
+                self.collection.delete(where={"version": version})
+                logger.info(f"Cleared documents for version {version}")
+            except Exception:
+                # Fallback for ChromaDB versions without delete(where=...):
+                # page through IDs in bounded chunks (include=[] skips
+                # documents/metadatas/embeddings) so neither the fetch nor
+                # the delete ever holds millions of ID strings at once
+                deleted = 0
+                while True:
+                    page = self.collection.get(
+                        where={"version": version},
+                        include=[],
+                        limit=10000,
+                    )
+                    page_ids = page["ids"]
+                    if not page_ids:
+                        break
+                    self.collection.delete(ids=page_ids)
+                    deleted += len(page_ids)
+                    logger.debug(f"Deleted {deleted} documents for version {version} so far")
+
+                if deleted:
+                    logger.info(f"Cleared {deleted} documents for version {version}")
+
+            if self._version_counts is not None:
+                self._version_counts.pop(version, None)
+                self._save_version_counts()
+            self._drop_memory_index()
 
             return True
 
@@ -367,6 +864,81 @@ class VectorStore:
             logger.error(f"Error clearing version: {e}")
             return False
 
+    def _get_version_counts(self) -> Counter:
+        """Get per-version document counts, loading or rebuilding as needed.
+
+        Counts are maintained incrementally by add_sections/clear_version and
+        persisted to a sidecar file; a full metadata scan only happens when
+        the sidecar is missing or out of sync with the collection.
+
+        Returns:
+            Counter mapping version to document count
+        """
+        total_count = self.collection.count()
+
+        if self._version_counts is None:
+            try:
+                with open(self._version_counts_path) as f:
+                    self._version_counts = Counter(json.load(f))
+                logger.debug("Loaded version counts from sidecar file")
+            except (OSError, ValueError):
+                self._version_counts = None
+
+        # Rebuild if counts are missing or stale (e.g. the collection was
+        # modified by another process). Prefer K tiny filtered counts over
+        # pulling every document's metadata across the wire.
+        if self._version_counts is None or sum(self._version_counts.values()) != total_count:
+            counts: Counter = Counter()
+            versions = self._known_versions | set(self._version_counts or ())
+            for version in versions:
+                count = self._count_version(version)
+                if count:
+                    counts[version] = count
+
+            # Filtered counts only cover known versions; fall back to a full
+            # metadata scan when documents exist under versions we missed
+            if sum(counts.values()) != total_count:
+                counts = Counter()
+                all_docs = self.collection.get(include=["metadatas"])
+                for metadata in all_docs.get("metadatas", []):
+                    counts[metadata.get("version", "unknown")] += 1
+                logger.debug("Rebuilt version counts from metadata scan")
+            else:
+                logger.debug("Rebuilt version counts from filtered counts")
+
+            self._known_versions.update(counts)
+            self._version_counts = counts
+            self._save_version_counts()
+
+        return self._version_counts
+
+    def _count_version(self, version: str) -> int:
+        """Count documents for a single version without fetching payloads.
+
+        Args:
+            version: Laravel version
+
+        Returns:
+            Document count for the version
+        """
+        try:
+            # Newer ChromaDB versions support filtered counts server-side
+            return self.collection.count(where={"version": version})
+        except TypeError:
+            # Fallback: ids-only fetch (include=[] skips all payload fields)
+            results = self.collection.get(where={"version": version}, include=[])
+            return len(results.get("ids", []))
+
+    def _save_version_counts(self) -> None:
+        """Persist version counts to the sidecar file."""
+        if self._version_counts is None:
+            return
+        try:
+            with open(self._version_counts_path, "w") as f:
+                json.dump(dict(self._version_counts), f)
+        except OSError as e:
+            logger.warning(f"Could not persist version counts: {e}")
+
     def get_stats(self) -> Dict:
         """Get statistics about the vector store.
 
@@ -376,12 +948,9 @@ class VectorStore:
         try:
             total_count = self.collection.count()
 
-            # Get version distribution
-            all_docs = self.collection.get()
-            versions = {}
-            for metadata in all_docs.get("metadatas", []):
-                version = metadata.get("version", "unknown")
-                versions[version] = versions.get(version, 0) + 1
+            # Get version distribution from incremental counters (O(versions)
+            # instead of scanning every document's metadata)
+            versions = dict(self._get_version_counts())
 
             return {
                 "total_documents": total_count,
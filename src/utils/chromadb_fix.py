@@ -5,8 +5,11 @@ that occur with ChromaDB 0.4.22 and Posthog 6.x.
 """
 
 import os
-import sys
-from unittest.mock import MagicMock
+
+
+def _noop_capture(*args, **kwargs):
+    """Swallow any telemetry capture call (hot: invoked per Chroma op)."""
+    return None
 
 
 def disable_chromadb_telemetry():
@@ -19,17 +22,17 @@ def disable_chromadb_telemetry():
         # Try to patch posthog before it's imported by chromadb
         import posthog
 
-        # Create a mock capture method that accepts any arguments
-        def mock_capture(*args, **kwargs):
-            pass
+        # Flag the library as disabled so its own entry points return
+        # before building event payloads
+        posthog.disabled = True
 
-        # Replace the capture method
+        # Replace the capture entry points with a single shared no-op
         if hasattr(posthog, 'capture'):
-            posthog.capture = mock_capture
+            posthog.capture = _noop_capture
 
         # Also patch the Posthog class if it exists
         if hasattr(posthog, 'Posthog'):
-            posthog.Posthog.capture = mock_capture
+            posthog.Posthog.capture = _noop_capture
 
     except ImportError:
         # Posthog not installed, nothing to patch
@@ -0,0 +1,52 @@
+"""Shared Ollama client pool with HTTP keep-alive."""
+
+from functools import lru_cache
+
+import httpx
+import ollama
+
+from src.utils.logger import app_logger as logger
+
+
+@lru_cache(maxsize=8)
+def get_ollama_client(host: str) -> ollama.Client:
+    """Get a shared Ollama client for a host.
+
+    Clients are cached per host so every RAGChain and OllamaEmbeddings
+    instance reuses one connection pool, keeping TCP connections alive
+    across requests instead of reconnecting per call.
+
+    Args:
+        host: Ollama API base URL
+
+    Returns:
+        Shared ollama.Client instance for the host
+    """
+    logger.debug(f"Creating pooled Ollama client for {host}")
+    return ollama.Client(
+        host=host,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+
+
+@lru_cache(maxsize=8)
+def get_async_ollama_client(host: str) -> ollama.AsyncClient:
+    """Get a shared async Ollama client for a host.
+
+    The async variant lets event-loop callers (e.g. FastAPI handlers)
+    await LLM round-trips without blocking the loop, while sharing one
+    keep-alive connection pool per host just like the sync client.
+
+    Args:
+        host: Ollama API base URL
+
+    Returns:
+        Shared ollama.AsyncClient instance for the host
+    """
+    logger.debug(f"Creating pooled async Ollama client for {host}")
+    return ollama.AsyncClient(
+        host=host,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
@@ -1,27 +1,26 @@
 """Pytest configuration and shared fixtures."""
 
-import pytest
-from pathlib import Path
+import asyncio
+import hashlib
+import os
 import tempfile
-import shutil
-
-
-@pytest.fixture(scope="session")
-def temp_dir():
-    """Create a temporary directory for tests."""
-    temp_path = Path(tempfile.mkdtemp())
-    yield temp_path
-    shutil.rmtree(temp_path)
 
-
-@pytest.fixture
-def sample_docs_dir(temp_dir):
-    """Create sample documentation structure."""
-    docs_dir = temp_dir / "docs"
-    docs_dir.mkdir()
-
-    # Create sample markdown files
-    (docs_dir / "eloquent.md").write_text("""
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+# Point the app at an isolated sandbox before anything imports src.config
+# (which builds the global Settings on import). Without this, the session
+# would ingest fixture docs into the developer's real ./chromadb index and
+# scatter logs/ and sources/ into the working directory. setdefault keeps
+# explicit overrides from the environment working.
+_test_root = tempfile.mkdtemp(prefix="laravel-rag-tests-")
+os.environ.setdefault("CHROMA_PERSIST_DIR", os.path.join(_test_root, "chromadb"))
+os.environ.setdefault("DOCS_CACHE_DIR", os.path.join(_test_root, "sources"))
+os.environ.setdefault("LOG_FILE", os.path.join(_test_root, "logs", "laravel-rag.log"))
+
+ELOQUENT_MD = """
 # Eloquent ORM
 
 ## Defining Models
@@ -31,9 +30,9 @@ Create models using Artisan command.
 ## Retrieving Models
 
 Retrieve all models from database.
-""")
+"""
 
-    (docs_dir / "migrations.md").write_text("""
+MIGRATIONS_MD = """
 # Database Migrations
 
 ## Creating Migrations
@@ -43,6 +42,91 @@ Use Artisan to create migrations.
 ## Running Migrations
 
 Execute migrations with Artisan.
-""")
+"""
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop so async session fixtures can share it."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create an async test client once per session.
+
+    LifespanManager runs the app lifespan (vector store and RAG chain
+    construction) a single time, and the async client lets tests issue
+    concurrent requests on one event loop instead of serializing through
+    a sync TestClient.
+
+    The app import lives here rather than at module level so collecting
+    tests (or running a subset that never touches the API) doesn't pay
+    for building the FastAPI app and its routers.
+    """
+    from src.api.main import app
+
+    async with LifespanManager(app):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as test_client:
+            yield test_client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def indexed_client(client, sample_docs_dir):
+    """Test client whose vector store has the sample docs ingested.
+
+    Ingestion (parsing + embedding + storage) runs once per session, so
+    endpoint tests can assert on real results instead of tolerating a
+    cold index.
+    """
+    from src.api import main
+    from src.extraction.markdown_parser import MarkdownParser
+
+    parser = MarkdownParser(version="12")
+    sections = parser.parse_directory(sample_docs_dir, max_workers=2)
+    main.vector_store.add_sections(sections, batch_size=10)
+    return client
+
+
+@pytest.fixture(scope="session")
+def temp_dir(tmp_path_factory):
+    """Create a temporary directory for tests.
+
+    pytest's factory handles cleanup via numbered-directory retention,
+    so no rmtree walk is needed at teardown.
+    """
+    return tmp_path_factory.mktemp("rag-tests")
+
+
+@pytest.fixture(scope="session")
+def sample_docs_dir(tmp_path_factory):
+    """Provide the sample documentation directory.
+
+    The directory name embeds a hash of the fixture content and lives
+    above pytest's per-run basetemp, so repeated test runs reuse the
+    files already on disk instead of rewriting them. Changing the
+    markdown constants changes the hash and forces a fresh directory.
+    """
+    digest = hashlib.blake2b(
+        (ELOQUENT_MD + MIGRATIONS_MD).encode(), digest_size=8
+    ).hexdigest()
+    # Under xdist the basetemp is the per-worker dir inside the numbered
+    # per-run dir; climb out of it so the cache sits next to the numbered
+    # dirs, outside pytest's retention sweep
+    base = tmp_path_factory.getbasetemp()
+    if base.name.startswith("popen-"):
+        base = base.parent
+    docs_dir = base.parent / f"rag-docs-{digest}"
+
+    if not docs_dir.exists():
+        # exist_ok: concurrent workers may create the dir simultaneously,
+        # and they write identical content
+        docs_dir.mkdir(parents=True, exist_ok=True)
+        (docs_dir / "eloquent.md").write_text(ELOQUENT_MD)
+        (docs_dir / "migrations.md").write_text(MIGRATIONS_MD)
 
     return docs_dir
@@ -4,19 +4,7 @@ import pytest
 from pathlib import Path
 from src.extraction.markdown_parser import MarkdownParser, DocSection
 
-
-class TestMarkdownParser:
-    """Test cases for MarkdownParser."""
-
-    @pytest.fixture
-    def parser(self):
-        """Create a parser instance."""
-        return MarkdownParser(version="12")
-
-    @pytest.fixture
-    def sample_markdown(self, tmp_path):
-        """Create a sample markdown file."""
-        content = """# Eloquent ORM
+SAMPLE_MD = """# Eloquent ORM
 
 ## Defining Models
 
@@ -34,12 +22,29 @@ You can retrieve models using:
 $flights = Flight::all();
 ```
 """
-        file_path = tmp_path / "eloquent.md"
-        file_path.write_text(content)
+
+
+class TestMarkdownParser:
+    """Test cases for MarkdownParser."""
+
+    @pytest.fixture(scope="module")
+    def parser(self):
+        """Create a parser instance shared across the module.
+
+        The parser is used read-only by these tests, so one instance
+        (and one set of compiled patterns) serves every case.
+        """
+        return MarkdownParser(version="12")
+
+    @pytest.fixture(scope="session")
+    def sample_markdown(self, tmp_path_factory):
+        """Write the sample markdown file once per session."""
+        file_path = tmp_path_factory.mktemp("md") / "eloquent.md"
+        file_path.write_text(SAMPLE_MD)
         return file_path
 
     def test_parse_file(self, parser, sample_markdown):
-        """Test parsing a markdown file."""
+        """Test parsing a markdown file from disk."""
         sections = parser.parse_file(sample_markdown)
 
         assert len(sections) == 2
@@ -48,6 +53,15 @@ $flights = Flight::all();
         assert sections[0].version == "12"
         assert "php artisan make:model" in sections[0].content
 
+    def test_parse_string(self, parser):
+        """Test parsing markdown content directly from memory."""
+        sections = parser.parse_string(SAMPLE_MD, "eloquent.md")
+
+        assert len(sections) == 2
+        assert sections[0].section == "Defining Models"
+        assert sections[1].section == "Retrieving Models"
+        assert sections[0].anchor == "eloquent.md#defining-models"
+
     def test_generate_anchor(self, parser):
         """Test anchor generation."""
         anchor = parser._generate_anchor("eloquent.md", "Defining Models")
@@ -58,10 +72,17 @@ $flights = Flight::all();
         assert "(" not in anchor
         assert ")" not in anchor
 
-    def test_clean_content(self, parser):
+    @pytest.mark.parametrize(
+        "dirty,first_line",
+        [
+            pytest.param("Line 1\n\n\n\nLine 2  \nLine 3", "Line 1", id="blank-runs"),
+            pytest.param("  \nA\n\n\n\n\nB", "A", id="leading-whitespace"),
+            pytest.param("Text   with    runs of spaces", "Text with runs of spaces", id="space-runs"),
+        ],
+    )
+    def test_clean_content(self, parser, dirty, first_line):
         """Test content cleaning."""
-        dirty_content = "Line 1\n\n\n\nLine 2  \nLine 3"
-        clean = parser.clean_content(dirty_content)
+        clean = parser.clean_content(dirty)
 
         assert "\n\n\n" not in clean
-        assert clean.startswith("Line 1")
+        assert clean.startswith(first_line)